@@ -0,0 +1,4 @@
+import os
+
+# Установка флага тестирования до импорта приложения в тестовых модулях
+os.environ["TESTING"] = "1"
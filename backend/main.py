@@ -1,12 +1,30 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Response
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel as PydanticBaseModel, ConfigDict
-from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from fastapi import FastAPI, HTTPException, Body, Depends, Header, Query, status, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict, ValidationError, field_validator
+from sqlalchemy import Column, Index, Integer, String, bindparam, delete, event, insert, inspect, select, text
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, async_scoped_session, AsyncSession
+from sqlalchemy.orm import Session, declarative_base, raiseload
 from sqlalchemy.pool import StaticPool
+import asyncio
+import hashlib
+import orjson
 import os
 
 
+# Connection budget: all uvicorn workers together stay within DB_CONNECTION_BUDGET (default 80),
+# leaving headroom under PostgreSQL's default max_connections=100 for admin and maintenance sessions.
+# Each worker gets an equal share, split between the persistent pool and overflow.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "4"))
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "80"))
+WORKER_CONNECTION_SHARE = DB_CONNECTION_BUDGET // WEB_CONCURRENCY
+
+
+# Sync session class behind every AsyncSession the app creates; ORM events are registered on it
+class DatabaseSyncSession(Session):
+    pass
+
+
 # Database configuration handler
 def initialize_database():
     if not os.getenv("TESTING"):
@@ -16,41 +34,78 @@ def initialize_database():
         database_host = os.getenv("DB_HOST", "postgres")
         database_port = os.getenv("DB_PORT", "5432")
 
-        connection_string = f"postgresql://{database_user}:{database_password}@{database_host}:{database_port}/{database_name}"
-
-        database_engine = create_engine(connection_string)
-        DatabaseSession = sessionmaker(autocommit=False, autoflush=False, bind=database_engine)
+        # Refuse to start rather than silently open more connections than the budget allows
+        if WORKER_CONNECTION_SHARE < 2:
+            raise RuntimeError(
+                f"DB_CONNECTION_BUDGET={DB_CONNECTION_BUDGET} gives each of {WEB_CONCURRENCY} workers "
+                f"fewer than 2 connections; raise the budget or lower WEB_CONCURRENCY"
+            )
+
+        connection_string = f"postgresql+asyncpg://{database_user}:{database_password}@{database_host}:{database_port}/{database_name}"
+
+        database_engine = create_async_engine(
+            connection_string,
+            pool_size=int(os.getenv("DB_POOL_SIZE", str(WORKER_CONNECTION_SHARE - WORKER_CONNECTION_SHARE // 4))),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", str(WORKER_CONNECTION_SHARE // 4))),
+            pool_timeout=30,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            query_cache_size=1200,
+        )
+        DatabaseSession = async_sessionmaker(
+            bind=database_engine,
+            class_=AsyncSession,
+            sync_session_class=DatabaseSyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
         ModelBase = declarative_base()
         return database_engine, DatabaseSession, ModelBase
     else:
         ModelBase = declarative_base()
 
-        test_database_url = "sqlite:///:memory:"
+        test_database_url = "sqlite+aiosqlite:///file:people_records_test?mode=memory&cache=shared&uri=true"
 
-        database_engine = create_engine(
+        database_engine = create_async_engine(
             test_database_url,
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,
         )
-        return database_engine, sessionmaker(bind=database_engine), ModelBase
+
+        # Let SQLAlchemy emit BEGIN itself so tests can wrap requests in SAVEPOINTs and roll back
+        @event.listens_for(database_engine.sync_engine, "connect")
+        def disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(database_engine.sync_engine, "begin")
+        def emit_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        DatabaseSession = async_sessionmaker(
+            bind=database_engine,
+            class_=AsyncSession,
+            sync_session_class=DatabaseSyncSession,
+            expire_on_commit=False,
+        )
+        return database_engine, DatabaseSession, ModelBase
 
 
 engine, DatabaseSessionLocal, Base = initialize_database()
+DatabaseSessionScoped = async_scoped_session(DatabaseSessionLocal, scopefunc=asyncio.current_task)
 
 
 # Data entity definition
 class PersonRecord(Base):
     __tablename__ = "people_records"
+    __table_args__ = (Index("ix_people_name", "name"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     age = Column(Integer, nullable=False)
     address = Column(String, nullable=False)
     work = Column(String, nullable=False)
-
-
-# Initialize database schema
-Base.metadata.create_all(bind=engine)
+    # Bumped in SQL by every PATCH; drives the ETag of GET /persons/{id}
+    row_version = Column(Integer, nullable=False, server_default="1")
 
 
 # Data validation schemas
@@ -70,34 +125,279 @@ class PersonOutputData(PersonInputData):
     id: int
 
 
+class PersonUpdateData(PydanticBaseModel):
+    model_config = ConfigDict(extra="forbid")
+    name: str | None = None
+    age: int | None = None
+    address: str | None = None
+    work: str | None = None
+
+    # Fields may be omitted, but every column is NOT NULL, so an explicit null is invalid
+    @field_validator("name", "age", "address", "work")
+    @classmethod
+    def reject_explicit_null(cls, field_value):
+        if field_value is None:
+            raise ValueError("Field may not be null")
+        return field_value
+
+
+# Reads select plain table columns, so they run as Core statements and skip ORM execution entirely
+people_table = PersonRecord.__table__
+PERSON_OUTPUT_COLUMNS = tuple(people_table.c[field_name] for field_name in PersonOutputData.model_fields)
+
+
+# Core read of a single person: rows come back as mappings, no ORM instance is built
+GET_BY_ID = select(*PERSON_OUTPUT_COLUMNS, people_table.c.row_version).where(people_table.c.id == bindparam("id"))
+# "fetch" syncs the session from the RETURNING ids; "evaluate" cannot resolve the bindparam
+DELETE_BY_ID = (
+    delete(PersonRecord)
+    .where(PersonRecord.id == bindparam("id"))
+    .returning(PersonRecord.id)
+    .execution_options(synchronize_session="fetch")
+)
+
+
 class ErrorMessageData(PydanticBaseModel):
     error_text: str
 
 
+# JSON responses rendered by orjson; Pydantic models are dumped without an intermediate dict pass
+class ORJSONResponse(JSONResponse):
+    def render(self, content):
+        return orjson.dumps(content, default=lambda model: model.model_dump())
+
+
 def create_error_response(error_message, http_code):
-    return JSONResponse(
-        content=ErrorMessageData(error_text=error_message).model_dump(),
+    return ORJSONResponse(
+        content=ErrorMessageData(error_text=error_message),
         status_code=http_code
     )
 
 
 # Application initialization
-api_application = FastAPI(title="People Records API", root_path="/api/v1")
+api_application = FastAPI(
+    title="People Records API", root_path="/api/v1", default_response_class=ORJSONResponse
+)
+
+
+# Arbitrary application-wide key for the PostgreSQL advisory lock that serializes schema DDL
+SCHEMA_LOCK_KEY = 728190341
+
+
+# Initialize database schema: workers take the advisory lock in turn, so one runs the DDL while
+# the rest wait and then find the tables already in place; nobody proceeds before the schema exists
+@api_application.on_event("startup")
+async def initialize_database_schema():
+    async with engine.begin() as schema_connection:
+        if engine.dialect.name == "postgresql":
+            await schema_connection.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_key)"), {"lock_key": SCHEMA_LOCK_KEY}
+            )
+        await create_people_records_schema(schema_connection)
+
+
+async def create_people_records_schema(schema_connection):
+    await schema_connection.run_sync(Base.metadata.create_all)
+
+    # Tables created before row versioning have no such column and create_all won't add it.
+    # ALTER TABLE takes an ACCESS EXCLUSIVE lock even when the column exists, so check first.
+    people_columns = await schema_connection.run_sync(list_people_records_columns)
+    if "row_version" not in people_columns:
+        await schema_connection.execute(text(
+            "ALTER TABLE people_records ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"
+        ))
+    # create_all skips indexes of tables that already exist
+    people_indexes = await schema_connection.run_sync(list_people_records_indexes)
+    if "ix_people_name" not in people_indexes:
+        await schema_connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_people_name ON people_records (name)"
+        ))
+
+
+def list_people_records_columns(sync_connection):
+    return {column["name"] for column in inspect(sync_connection).get_columns("people_records")}
+
+
+def list_people_records_indexes(sync_connection):
+    return {index["name"] for index in inspect(sync_connection).get_indexes("people_records")}
+
+
+# Pre-create pooled connections so first requests skip connect/SSL setup
+@api_application.on_event("startup")
+async def warm_up_connection_pool():
+    if os.getenv("TESTING"):
+        return
+
+    warm_sessions = [DatabaseSessionLocal() for _ in range(engine.pool.size())]
+    try:
+        await asyncio.gather(*(warm_session.connection() for warm_session in warm_sessions))
+    finally:
+        await asyncio.gather(*(warm_session.close() for warm_session in warm_sessions))
+
+
+# Outside production every ORM SELECT must load relationships explicitly
+ENFORCE_EXPLICIT_LOADING = bool(os.getenv("TESTING")) or os.getenv("APP_ENV", "production") != "production"
+
+
+def enforce_explicit_loading(orm_execute_state):
+    if (
+        orm_execute_state.is_select
+        and orm_execute_state.is_orm_statement
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+if ENFORCE_EXPLICIT_LOADING:
+    event.listen(DatabaseSyncSession, "do_orm_execute", enforce_explicit_loading)
+
+
+# Compile the statements the read and delete handlers run so first requests hit the compiled cache.
+# PATCH's UPDATE depends on which columns changed and INSERT would consume a sequence value,
+# so neither is warmed here.
+@api_application.on_event("startup")
+async def warm_up_statement_cache():
+    async with DatabaseSessionLocal() as warm_session:
+        await warm_session.get(PersonRecord, 0)
+        await warm_session.execute(GET_BY_ID, {"id": 0})
+        await warm_session.execute(
+            select(*PERSON_OUTPUT_COLUMNS).order_by(people_table.c.id).limit(1).offset(0)
+        )
+        await warm_session.execute(DELETE_BY_ID, {"id": 0})
+        await warm_session.rollback()
+
+
+# Group commit for POST /persons: inserts arriving within a short window share one
+# INSERT ... RETURNING and one commit, so a burst pays for a single WAL flush
+WRITE_BATCH_WINDOW = int(os.getenv("WRITE_BATCH_WINDOW_MS", "2")) / 1000
+WRITE_BATCH_MAX_SIZE = int(os.getenv("WRITE_BATCH_MAX_SIZE", "100"))
+
+person_insert_queue = None
+person_insert_batch_task = None
+
+
+async def collect_person_insert_batch(insert_queue, pending_inserts):
+    pending_inserts.append(await insert_queue.get())
+    batch_deadline = asyncio.get_running_loop().time() + WRITE_BATCH_WINDOW
+
+    while len(pending_inserts) < WRITE_BATCH_MAX_SIZE:
+        remaining_window = batch_deadline - asyncio.get_running_loop().time()
+        if remaining_window <= 0:
+            break
+        try:
+            pending_inserts.append(await asyncio.wait_for(insert_queue.get(), remaining_window))
+        except asyncio.TimeoutError:
+            break
+
+
+def is_rejected_row_error(insert_error):
+    # SQLSTATE classes 22 (data exception) and 23 (integrity violation) mean the database refused a row.
+    # Drivers that cannot bind a value at all raise ValueError (asyncpg, wrapped) or OverflowError (sqlite3, raw)
+    if isinstance(insert_error, (DataError, IntegrityError, OverflowError)):
+        return True
+    if isinstance(insert_error, DBAPIError):
+        sqlstate = str(getattr(insert_error.orig, "sqlstate", None) or "")
+        return sqlstate[:2] in ("22", "23") or isinstance(insert_error.orig.__cause__, ValueError)
+    return False
+
+
+def fail_person_inserts(pending_inserts, insert_error):
+    for _, insert_future in pending_inserts:
+        if not insert_future.done():
+            insert_future.set_exception(insert_error)
+
+
+async def write_person_inserts(pending_inserts):
+    try:
+        async with DatabaseSessionLocal() as batch_session:
+            try:
+                insert_result = await batch_session.execute(
+                    insert(PersonRecord).returning(PersonRecord.id, sort_by_parameter_order=True),
+                    [person_values for person_values, _ in pending_inserts]
+                )
+            except Exception as insert_error:
+                if len(pending_inserts) == 1 or not is_rejected_row_error(insert_error):
+                    raise
+                insert_result = None
+            if insert_result is not None:
+                created_identifiers = insert_result.scalars().all()
+                await batch_session.commit()
+    except Exception as batch_error:
+        # Connection and commit failures would hit every row again, so the whole batch fails at once
+        fail_person_inserts(pending_inserts, batch_error)
+        return
+
+    if insert_result is None:
+        # A single rejected row fails the whole multi-row INSERT; retry rows one at a time
+        # so only the request that sent the bad row gets the error
+        for pending_insert in pending_inserts:
+            await write_person_inserts([pending_insert])
+        return
+
+    for (_, insert_future), identifier in zip(pending_inserts, created_identifiers):
+        if not insert_future.done():
+            insert_future.set_result(identifier)
+
+
+async def run_person_insert_batches(insert_queue):
+    pending_inserts = []
+    try:
+        while True:
+            pending_inserts = []
+            await collect_person_insert_batch(insert_queue, pending_inserts)
+            await write_person_inserts(pending_inserts)
+    except asyncio.CancelledError:
+        # Requests of the batch being collected or written must not wait forever for a result
+        fail_person_inserts(pending_inserts, HTTPException(status_code=503, detail="Server is shutting down"))
+        raise
+
+
+async def enqueue_person_insert(person_values):
+    insert_future = asyncio.get_running_loop().create_future()
+    await person_insert_queue.put((person_values, insert_future))
+    return await insert_future
+
+
+@api_application.on_event("startup")
+async def start_person_insert_batching():
+    global person_insert_queue, person_insert_batch_task
+    if os.getenv("TESTING") or WRITE_BATCH_WINDOW <= 0:
+        return
+
+    person_insert_queue = asyncio.Queue()
+    person_insert_batch_task = asyncio.create_task(run_person_insert_batches(person_insert_queue))
+
+
+@api_application.on_event("shutdown")
+async def stop_person_insert_batching():
+    global person_insert_queue, person_insert_batch_task
+    if person_insert_batch_task is None:
+        return
+
+    person_insert_batch_task.cancel()
+    try:
+        await person_insert_batch_task
+    except asyncio.CancelledError:
+        pass
+
+    queued_inserts = []
+    while not person_insert_queue.empty():
+        queued_inserts.append(person_insert_queue.get_nowait())
+    fail_person_inserts(queued_inserts, HTTPException(status_code=503, detail="Server is shutting down"))
+    person_insert_queue, person_insert_batch_task = None, None
 
 
 # Database session management
-def obtain_database_session():
-    database_session = DatabaseSessionLocal()
+async def obtain_database_session():
     try:
-        yield database_session
+        yield DatabaseSessionScoped()
     finally:
-        database_session.close()
+        await DatabaseSessionScoped.remove()
 
 
-def fetch_person_record(identifier, database_session):
-    person_data = database_session.query(PersonRecord).filter(
-        PersonRecord.id == identifier
-    ).first()
+async def fetch_person_record(identifier, database_session):
+    person_data = await database_session.get(PersonRecord, identifier)
 
     if person_data is None:
         raise HTTPException(status_code=404, detail="Record not found")
@@ -105,55 +405,173 @@ def fetch_person_record(identifier, database_session):
     return person_data
 
 
-@api_application.get("/persons/{identifier}", response_model=PersonOutputData)
-def retrieve_person_record(identifier: int, database: Session = Depends(obtain_database_session)):
-    return fetch_person_record(identifier, database)
+def build_entity_tag(identifier, row_version):
+    return '"' + hashlib.md5(f"{identifier}:{row_version}".encode()).hexdigest() + '"'
+
+
+def parse_entity_tags(header_value):
+    return {entity_tag.strip().removeprefix("W/") for entity_tag in header_value.split(",")}
+
+
+# Full export as NDJSON; rows are fetched through a server-side cursor in chunks.
+# The session dependency is closed only after the streamed body has been sent.
+@api_application.get("/persons/stream")
+async def stream_all_persons(database: AsyncSession = Depends(obtain_database_session)):
+    async def generate_person_lines():
+        person_stream = await database.stream(
+            select(*PERSON_OUTPUT_COLUMNS).order_by(people_table.c.id).execution_options(yield_per=500)
+        )
+        async for person_row in person_stream:
+            yield orjson.dumps(dict(person_row._mapping)) + b"\n"
+
+    return StreamingResponse(generate_person_lines(), media_type="application/x-ndjson")
+
+
+# The database renders the whole list as one JSON document; SQLite variant serves the test engine
+PERSONS_JSON_QUERIES = {
+    "postgresql": text(
+        "SELECT COALESCE(jsonb_agg(jsonb_build_object("
+        "'id', p.id, 'name', p.name, 'age', p.age, 'address', p.address, 'work', p.work"
+        ") ORDER BY p.id), '[]'::jsonb)::text FROM people_records p"
+    ),
+    "sqlite": text(
+        "SELECT COALESCE(json_group_array(json_object("
+        "'id', p.id, 'name', p.name, 'age', p.age, 'address', p.address, 'work', p.work"
+        ")), '[]') FROM (SELECT * FROM people_records ORDER BY id) p"
+    ),
+}
+
 
+@api_application.get("/persons/json", responses={200: {"model": list[PersonOutputData]}})
+async def retrieve_all_persons_json(database: AsyncSession = Depends(obtain_database_session)):
+    query_result = await database.execute(PERSONS_JSON_QUERIES[engine.dialect.name])
+    return Response(content=query_result.scalar_one(), media_type="application/json")
 
-@api_application.get("/persons", response_model=list[PersonOutputData])
-def retrieve_all_persons(database: Session = Depends(obtain_database_session)):
-    return database.query(PersonRecord).all()
+
+# Read endpoints skip response_model validation: rows already satisfy the schema
+@api_application.get("/persons/{identifier}", responses={200: {"model": PersonOutputData}})
+async def retrieve_person_record(
+        identifier: int,
+        if_none_match: str | None = Header(None),
+        database: AsyncSession = Depends(obtain_database_session)
+):
+    query_result = await database.execute(GET_BY_ID, {"id": identifier})
+    person_row = query_result.mappings().first()
+    if person_row is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+
+    person_data = dict(person_row)
+    entity_tag = build_entity_tag(identifier, person_data.pop("row_version"))
+    if if_none_match is not None and entity_tag in parse_entity_tags(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entity_tag})
+
+    return ORJSONResponse(content=person_data, headers={"ETag": entity_tag})
+
+
+@api_application.get("/persons", responses={200: {"model": list[PersonOutputData]}})
+async def retrieve_all_persons(
+        limit: int = Query(100, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+        database: AsyncSession = Depends(obtain_database_session)
+):
+    # Plain column rows skip ORM instance hydration and identity-map bookkeeping
+    query_result = await database.execute(
+        select(*PERSON_OUTPUT_COLUMNS).order_by(people_table.c.id).limit(limit).offset(offset)
+    )
+    return ORJSONResponse(content=[dict(person_row._mapping) for person_row in query_result])
 
 
 @api_application.post("/persons", status_code=status.HTTP_201_CREATED)
-def add_person_record(
+async def add_person_record(
         person_input: PersonCreationData,
         http_response: Response,
-        database: Session = Depends(obtain_database_session)
+        database: AsyncSession = Depends(obtain_database_session)
 ):
-    new_person = PersonRecord(**person_input.model_dump())
-    database.add(new_person)
-    database.commit()
-    database.refresh(new_person)
+    if person_insert_queue is not None:
+        new_identifier = await enqueue_person_insert(person_input.model_dump())
+    else:
+        insert_result = await database.execute(
+            insert(PersonRecord).values(**person_input.model_dump()).returning(PersonRecord.id)
+        )
+        new_identifier = insert_result.scalar_one()
+        await database.commit()
 
-    http_response.headers["Location"] = f"/persons/{new_person.id}"
+    http_response.headers["Location"] = f"/persons/{new_identifier}"
     return None
 
 
-@api_application.patch("/persons/{identifier}", response_model=PersonOutputData)
-def modify_person_record(
+# Batch creation: one executemany INSERT ... RETURNING and a single commit
+@api_application.post("/persons/bulk", status_code=status.HTTP_201_CREATED, response_model=list[str])
+async def add_person_records_bulk(
+        persons_input: list[PersonCreationData],
+        database: AsyncSession = Depends(obtain_database_session)
+):
+    if not persons_input:
+        return []
+
+    insert_result = await database.execute(
+        insert(PersonRecord).returning(PersonRecord.id, sort_by_parameter_order=True),
+        [person_input.model_dump() for person_input in persons_input]
+    )
+    created_identifiers = insert_result.scalars().all()
+    await database.commit()
+
+    return [f"/persons/{identifier}" for identifier in created_identifiers]
+
+
+# The body is read as a plain dict so that bad fields map to 400; its schema is published by hand
+@api_application.patch(
+    "/persons/{identifier}",
+    response_model=PersonOutputData,
+    openapi_extra={"requestBody": {
+        "content": {"application/json": {"schema": PersonUpdateData.model_json_schema()}},
+        "required": True,
+    }},
+)
+async def modify_person_record(
         identifier: int,
-        update_data: dict,
-        database: Session = Depends(obtain_database_session)
+        update_data: dict = Body(...),
+        database: AsyncSession = Depends(obtain_database_session)
 ):
-    person_record = fetch_person_record(identifier, database)
+    # A missing record is reported before the body is looked at, as it was before validation moved here
+    person_record = await fetch_person_record(identifier, database)
 
-    for attribute_name, attribute_value in update_data.items():
-        if not hasattr(person_record, attribute_name):
-            return create_error_response("Invalid field provided", 400)
+    try:
+        validated_update = PersonUpdateData.model_validate(update_data)
+    except ValidationError:
+        return create_error_response("Invalid field provided", 400)
+
+    for attribute_name, attribute_value in validated_update.model_dump(exclude_unset=True).items():
         setattr(person_record, attribute_name, attribute_value)
+    # Incremented in the UPDATE itself, so overlapping PATCHes both apply and the last one wins
+    person_record.row_version = PersonRecord.row_version + 1
 
-    database.commit()
-    database.refresh(person_record)
+    await database.commit()
     return person_record
 
 
 @api_application.delete("/persons/{identifier}", status_code=204)
-def remove_person_record(
+async def remove_person_record(
         identifier: int,
-        database: Session = Depends(obtain_database_session)
+        database: AsyncSession = Depends(obtain_database_session)
 ):
-    person_data = fetch_person_record(identifier, database)
+    delete_result = await database.execute(DELETE_BY_ID, {"id": identifier})
+    if delete_result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+
+    await database.commit()
 
-    database.delete(person_data)
-    database.commit()
\ No newline at end of file
+
+# Worker processes only pay off because every handler is async and never blocks the event loop
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "main:api_application",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+        backlog=2048,
+    )
@@ -1,3 +1,6 @@
 #!/usr/bin/env bash
 
-exec uvicorn main:app --host ${HOST:-0.0.0.0} --port ${PORT:-8000}
+# Each worker sizes its DB pool to DB_CONNECTION_BUDGET / WEB_CONCURRENCY (see main.py),
+# so raising WEB_CONCURRENCY does not raise the total number of Postgres connections.
+exec uvicorn main:api_application --host ${HOST:-0.0.0.0} --port ${PORT:-8000} \
+    --loop uvloop --http httptools --workers ${WEB_CONCURRENCY:-4} --backlog 2048
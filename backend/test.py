@@ -1,41 +1,98 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import os
-
-# Установка флага тестирования
-os.environ["TESTING"] = "1"
+from sqlalchemy import Column, ForeignKey, Integer, event, insert, select, text
+from sqlalchemy.exc import InvalidRequestError, OperationalError
+from sqlalchemy.orm import declarative_base, relationship
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import json
 
 # Импорт компонентов приложения
-from main import api_application, obtain_database_session, Base, PersonRecord, engine
+import main
+from main import api_application, obtain_database_session, create_people_records_schema, list_people_records_columns, list_people_records_indexes, modify_person_record, engine, PersonRecord, DatabaseSyncSession
+
+async def open_test_transaction():
+    connection = await engine.connect()
+    transaction = await connection.begin()
+    return connection, transaction
+
+
+async def close_test_transaction(database, connection, transaction):
+    await database.close()
+    await transaction.rollback()
+    await connection.close()
+
 
-# Создание тестовой сессии
-TestSessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Сессия поверх тестового соединения: её коммиты освобождают точку сохранения,
+# а не фиксируют внешнюю транзакцию
+def create_savepoint_session(connection):
+    return AsyncSession(
+        bind=connection,
+        sync_session_class=DatabaseSyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
 
 
-# Фикстура для базы данных
+# Клиент в контекстном менеджере: запуск startup-хуков (в т.ч. создание схемы)
+# и единый цикл событий на весь тест
 @pytest.fixture
-def test_database_session():
-    database = TestSessionFactory()
+def application_client():
+    with TestClient(api_application) as client:
+        yield client
+
+
+# Фикстура для базы данных: каждый тест работает во внешней транзакции,
+# коммиты приложения превращаются в точки сохранения и откатываются после теста.
+# Соединение открывается и закрывается в том же цикле событий, что обслуживает запросы
+@pytest.fixture
+def test_database_session(application_client):
+    connection, transaction = application_client.portal.call(open_test_transaction)
+    database = create_savepoint_session(connection)
     try:
         yield database
     finally:
-        database.close()
+        application_client.portal.call(close_test_transaction, database, connection, transaction)
 
 
 # Фикстура тестового клиента
 @pytest.fixture
-def test_client(test_database_session):
+def test_client(application_client, test_database_session):
     # Заменяем зависимость базы данных
     api_application.dependency_overrides[obtain_database_session] = lambda: test_database_session
 
-    # Инициализация схемы данных
-    Base.metadata.create_all(bind=engine)
-    yield TestClient(api_application)
-    # Очистка после тестов
-    Base.metadata.drop_all(bind=engine)
+    yield application_client
+    api_application.dependency_overrides.clear()
+
+
+# Отдельные модели со связью для проверки запрета ленивой загрузки;
+# таблицы создаются только внутри тестовой транзакции
+LoadingTestBase = declarative_base()
+
+
+class LoadingTestOwner(LoadingTestBase):
+    __tablename__ = "loading_test_owners"
+    id = Column(Integer, primary_key=True)
+    pets = relationship("LoadingTestPet")
+
+
+class LoadingTestPet(LoadingTestBase):
+    __tablename__ = "loading_test_pets"
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("loading_test_owners.id"))
+
+
+# Параллельные POST через ASGI-транспорт при включённой пакетной записи
+async def post_with_batching(payloads):
+    await main.start_person_insert_batching()
+    transport = httpx.ASGITransport(app=api_application, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await asyncio.gather(*(client.post("/persons", json=payload) for payload in payloads))
+    finally:
+        await main.stop_person_insert_batching()
 
 
 # Данные для тестирования
@@ -62,6 +119,102 @@ class TestPeopleRecordsAPI:
         assert result.status_code == 201
         assert result.headers["Location"] == "/persons/1"
 
+    def test_bulk_record_creation(self, test_client):
+        """Проверка пакетного создания записей"""
+        result = test_client.post("/persons/bulk", json=[SAMPLE_RECORD, UPDATED_RECORD])
+
+        assert result.status_code == 201
+        assert result.json() == ["/persons/1", "/persons/2"]
+        assert test_client.get("/persons/2").json()["name"] == "Janet Smithson"
+
+    def test_batched_record_creation(self, test_client, test_database_session, monkeypatch):
+        """Проверка группировки параллельных POST: разные id и изоляция ошибочной строки"""
+        # Пакетная запись пишет через тестовое соединение и собирает все запросы в один пакет
+        monkeypatch.delenv("TESTING")
+        monkeypatch.setattr(main, "WRITE_BATCH_WINDOW", 0.05)
+        monkeypatch.setattr(main, "DatabaseSessionLocal", lambda: create_savepoint_session(test_database_session.bind))
+        written_batch_sizes = []
+        write_person_inserts = main.write_person_inserts
+
+        async def record_batch_size(pending_inserts):
+            written_batch_sizes.append(len(pending_inserts))
+            await write_person_inserts(pending_inserts)
+
+        monkeypatch.setattr(main, "write_person_inserts", record_batch_size)
+        # Возраст вне диапазона INTEGER проходит валидацию, но отклоняется базой данных
+        payloads = [SAMPLE_RECORD, {**SAMPLE_RECORD, "age": 10 ** 30}, UPDATED_RECORD]
+
+        results = test_client.portal.call(post_with_batching, payloads)
+
+        assert written_batch_sizes[0] == len(payloads)
+        assert [result.status_code for result in results] == [201, 500, 201]
+        created_locations = [results[0].headers["Location"], results[2].headers["Location"]]
+        assert len(set(created_locations)) == 2
+        assert test_client.get(created_locations[0]).json()["name"] == "Johnathan Davis"
+        assert test_client.get(created_locations[1]).json()["name"] == "Janet Smithson"
+
+    def test_batched_commit_failure_is_not_retried(self, test_client, test_database_session, monkeypatch):
+        """Проверка отказа всего пакета без построчного повтора при ошибке фиксации"""
+        monkeypatch.delenv("TESTING")
+        monkeypatch.setattr(main, "WRITE_BATCH_WINDOW", 0.05)
+
+        def create_failing_commit_session():
+            batch_session = create_savepoint_session(test_database_session.bind)
+
+            async def fail_commit():
+                raise OperationalError("COMMIT", {}, ConnectionError("connection lost"))
+
+            batch_session.commit = fail_commit
+            return batch_session
+
+        monkeypatch.setattr(main, "DatabaseSessionLocal", create_failing_commit_session)
+        written_batch_sizes = []
+        write_person_inserts = main.write_person_inserts
+
+        async def record_batch_size(pending_inserts):
+            written_batch_sizes.append(len(pending_inserts))
+            await write_person_inserts(pending_inserts)
+
+        monkeypatch.setattr(main, "write_person_inserts", record_batch_size)
+
+        results = test_client.portal.call(post_with_batching, [SAMPLE_RECORD, UPDATED_RECORD])
+
+        assert written_batch_sizes == [2]
+        assert [result.status_code for result in results] == [500, 500]
+
+    def test_batching_shutdown_fails_pending_records(self, test_client, monkeypatch):
+        """Проверка ответа 503 для записей в работе и в очереди при остановке приложения"""
+        monkeypatch.delenv("TESTING")
+        monkeypatch.setattr(main, "WRITE_BATCH_WINDOW", 0.05)
+        monkeypatch.setattr(main, "WRITE_BATCH_MAX_SIZE", 1)
+
+        async def post_and_shut_down():
+            # Первый пакет зависает в записи, второй запрос остаётся в очереди
+            write_started = asyncio.Event()
+
+            async def hang_in_write(pending_inserts):
+                write_started.set()
+                await asyncio.Event().wait()
+
+            monkeypatch.setattr(main, "write_person_inserts", hang_in_write)
+            await main.start_person_insert_batching()
+            transport = httpx.ASGITransport(app=api_application, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                pending_posts = [
+                    asyncio.create_task(client.post("/persons", json=payload))
+                    for payload in (SAMPLE_RECORD, UPDATED_RECORD)
+                ]
+                await write_started.wait()
+                while main.person_insert_queue.qsize() < 1:
+                    await asyncio.sleep(0.01)
+                await main.stop_person_insert_batching()
+                return await asyncio.gather(*pending_posts)
+
+        results = test_client.portal.call(post_and_shut_down)
+
+        assert [result.status_code for result in results] == [503, 503]
+        assert all(result.json()["detail"] == "Server is shutting down" for result in results)
+
     def test_successful_record_retrieval(self, test_client):
         """Проверка получения данных записи"""
         # Создание тестовой записи
@@ -76,6 +229,83 @@ class TestPeopleRecordsAPI:
         assert response_data["name"] == "Johnathan Davis"
         assert response_data["age"] == 30
 
+    def test_conditional_record_retrieval(self, test_client):
+        """Проверка ответа 304 при совпадении ETag и его смены после обновления"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        entity_tag = test_client.get("/persons/1").headers["ETag"]
+
+        cached_result = test_client.get("/persons/1", headers={"If-None-Match": entity_tag})
+        assert cached_result.status_code == 304
+        assert cached_result.content == b""
+
+        test_client.patch("/persons/1", json={"age": 31})
+        fresh_result = test_client.get("/persons/1", headers={"If-None-Match": entity_tag})
+        assert fresh_result.status_code == 200
+        assert fresh_result.headers["ETag"] != entity_tag
+        assert fresh_result.json()["age"] == 31
+
+    def test_concurrent_record_modifications(self, test_client, test_database_session):
+        """Проверка двух пересекающихся обновлений одной записи: побеждает последнее"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        initial_tag = test_client.get("/persons/1").headers["ETag"]
+        first_session = create_savepoint_session(test_database_session.bind)
+        second_session = create_savepoint_session(test_database_session.bind)
+
+        async def modify_concurrently():
+            # Вторая сессия загружает запись до того, как первая зафиксирует изменения
+            stale_record = await second_session.get(PersonRecord, 1)
+            await modify_person_record(1, {"age": 40}, first_session)
+            assert (await modify_person_record(1, {"name": "Jon Davis"}, second_session)) is stale_record
+            await first_session.close()
+            await second_session.close()
+
+        test_client.portal.call(modify_concurrently)
+
+        result = test_client.get("/persons/1")
+        assert result.status_code == 200
+        assert result.json()["name"] == "Jon Davis"
+        assert result.json()["age"] == 40
+        assert result.headers["ETag"] != initial_tag
+
+    def test_record_reads_bypass_orm_execution(self, test_client, test_database_session):
+        """Проверка, что чтение записей выполняется через Core без ORM-обработки"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        executed_orm_flags = []
+        event.listen(
+            test_database_session.sync_session, "do_orm_execute",
+            lambda orm_execute_state: executed_orm_flags.append(orm_execute_state.is_orm_statement)
+        )
+
+        assert test_client.get("/persons/1").status_code == 200
+        assert test_client.get("/persons").status_code == 200
+        assert test_client.get("/persons/stream").status_code == 200
+
+        assert executed_orm_flags == [False, False, False]
+
+    def test_schema_upgrade_of_existing_table(self, test_client, test_database_session):
+        """Проверка дополнения таблицы, созданной до появления row_version и индекса по имени"""
+        async def upgrade_legacy_table():
+            connection = test_database_session.bind
+            await connection.execute(text("DROP TABLE people_records"))
+            await connection.execute(text(
+                "CREATE TABLE people_records (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                "age INTEGER NOT NULL, address VARCHAR NOT NULL, work VARCHAR NOT NULL)"
+            ))
+            await connection.execute(text(
+                "INSERT INTO people_records (name, age, address, work) VALUES ('Old', 1, 'Street', 'Job')"
+            ))
+            # Повторный запуск не должен ничего менять
+            await create_people_records_schema(connection)
+            await create_people_records_schema(connection)
+            people_columns = await connection.run_sync(list_people_records_columns)
+            people_indexes = await connection.run_sync(list_people_records_indexes)
+            return people_columns, people_indexes
+
+        people_columns, people_indexes = test_client.portal.call(upgrade_legacy_table)
+        assert "row_version" in people_columns
+        assert "ix_people_name" in people_indexes
+        assert test_client.get("/persons/1").headers["ETag"]
+
     def test_missing_record_retrieval(self, test_client):
         """Проверка обработки запроса отсутствующей записи"""
         result = test_client.get("/persons/999")
@@ -97,6 +327,41 @@ class TestPeopleRecordsAPI:
         assert response_data[0]["name"] == "Johnathan Davis"
         assert response_data[1]["name"] == "Janet Smithson"
 
+    def test_retrieve_records_page(self, test_client):
+        """Проверка постраничного получения записей"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        test_client.post("/persons", json=UPDATED_RECORD)
+
+        result = test_client.get("/persons", params={"limit": 1, "offset": 1})
+
+        assert result.status_code == 200
+        response_data = result.json()
+        assert len(response_data) == 1
+        assert response_data[0]["name"] == "Janet Smithson"
+
+    def test_stream_all_records(self, test_client):
+        """Проверка потоковой выгрузки записей в формате NDJSON"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        test_client.post("/persons", json=UPDATED_RECORD)
+
+        result = test_client.get("/persons/stream")
+
+        assert result.status_code == 200
+        response_lines = [json.loads(line) for line in result.text.splitlines()]
+        assert [line["name"] for line in response_lines] == ["Johnathan Davis", "Janet Smithson"]
+
+    def test_retrieve_all_records_as_json_document(self, test_client):
+        """Проверка получения списка записей, собранного на стороне БД"""
+        assert test_client.get("/persons/json").json() == []
+
+        test_client.post("/persons", json=SAMPLE_RECORD)
+        test_client.post("/persons", json=UPDATED_RECORD)
+
+        result = test_client.get("/persons/json")
+
+        assert result.status_code == 200
+        assert [record["name"] for record in result.json()] == ["Johnathan Davis", "Janet Smithson"]
+
     def test_successful_record_modification(self, test_client):
         """Проверка обновления данных записи"""
         # Создание исходной записи
@@ -111,6 +376,48 @@ class TestPeopleRecordsAPI:
         assert response_data["name"] == "Janet Smithson"
         assert response_data["age"] == 25
 
+    def test_modify_record_with_unknown_field(self, test_client):
+        """Проверка отклонения обновления с неизвестным полем"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+
+        result = test_client.patch("/persons/1", json={"id": 42})
+
+        assert result.status_code == 400
+        assert result.json()["error_text"] == "Invalid field provided"
+        assert test_client.get("/persons/1").json()["id"] == 1
+
+    def test_modify_record_with_null_field(self, test_client):
+        """Проверка отклонения обновления с явным null в обязательном поле"""
+        test_client.post("/persons", json=SAMPLE_RECORD)
+
+        result = test_client.patch("/persons/1", json={"name": None})
+
+        assert result.status_code == 400
+        assert test_client.get("/persons/1").json()["name"] == "Johnathan Davis"
+
+    def test_orm_select_gets_raiseload(self, test_client, test_database_session):
+        """Проверка запрета ленивой загрузки связей для ORM-запросов вне production"""
+        async def create_owner_with_pet():
+            connection = test_database_session.bind
+            await connection.run_sync(LoadingTestBase.metadata.create_all)
+            await connection.execute(insert(LoadingTestOwner), [{"id": 1}])
+            await connection.execute(insert(LoadingTestPet), [{"id": 1, "owner_id": 1}])
+
+        async def load_owner_pets(database):
+            owner = (await database.execute(select(LoadingTestOwner))).scalar_one()
+            # Ленивая загрузка в синхронном контексте, чтобы исключить MissingGreenlet
+            return await database.run_sync(lambda sync_session: len(owner.pets))
+
+        test_client.portal.call(create_owner_with_pet)
+
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            test_client.portal.call(load_owner_pets, test_database_session)
+
+        # Обычная сессия без хука загружает ту же связь
+        plain_session = AsyncSession(bind=test_database_session.bind)
+        assert test_client.portal.call(load_owner_pets, plain_session) == 1
+        test_client.portal.call(plain_session.close)
+
     def test_modify_missing_record(self, test_client):
         """Проверка обновления отсутствующей записи"""
         result = test_client.patch("/persons/999", json=UPDATED_RECORD)
@@ -118,6 +425,21 @@ class TestPeopleRecordsAPI:
         assert result.status_code == 404
         assert result.json()["detail"] == "Record not found"
 
+    def test_modify_missing_record_with_invalid_field(self, test_client):
+        """Проверка приоритета 404 над ошибкой тела запроса для отсутствующей записи"""
+        result = test_client.patch("/persons/999", json={"unknown": "value"})
+
+        assert result.status_code == 404
+        assert result.json()["detail"] == "Record not found"
+
+    def test_modification_schema_in_openapi(self, test_client):
+        """Проверка публикации схемы тела PATCH в OpenAPI"""
+        operation = test_client.get("/openapi.json").json()["paths"]["/persons/{identifier}"]["patch"]
+        body_schema = operation["requestBody"]["content"]["application/json"]["schema"]
+
+        assert set(body_schema["properties"]) == {"name", "age", "address", "work"}
+        assert body_schema["additionalProperties"] is False
+
     def test_successful_record_removal(self, test_client):
         """Проверка удаления записи"""
         # Создание записи для удаления